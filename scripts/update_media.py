@@ -5,30 +5,74 @@ Fetches Facebook followers, Google rating, new articles, and TV appearances.
 Updates data.json — designed to run in GitHub Actions (no API keys needed).
 """
 
+import asyncio
 import json
 import hashlib
+import importlib.util
 import re
 import subprocess
 import sys
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from pathlib import Path
 
-import feedparser
+import aiohttp
 import requests
 from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # several times faster than stdlib json for load/save
+except ImportError:
+    orjson = None
+
+try:
+    import fastfeedparser as feedparser  # lxml-based, much faster than feedparser
+except ImportError:
+    import feedparser
 
 # ─── CONFIG ──────────────────────────────────────────
 
 DATA_FILE = Path(__file__).parent.parent / "data.json"
 TW_TZ = timezone(timedelta(hours=8))
 
+# Only advertise br when the brotli package is there for requests/aiohttp to decode it
+if importlib.util.find_spec("brotli"):
+    ACCEPT_ENCODING = "gzip, deflate, br"
+else:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
+    "Accept-Language": "zh-TW,zh;q=0.9",
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+# Shared HTTP session: keep-alive connections are reused across every request
+# to the same host instead of paying a fresh TCP + TLS handshake each time.
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=20,
+    pool_maxsize=50,
+    max_retries=Retry(total=2, backoff_factor=0.3),
+))
+SESSION.headers.update(HTTP_HEADERS)
+
 # Doctor's name variants for search
 SEARCH_NAMES = ["楊智鈞", "俠醫楊智鈞"]
 
+# Single-pass "mentions the doctor" checks (one regex scan instead of one
+# substring scan per name). The broader one also accepts the clinic/nickname.
+_NAME_RE = re.compile("|".join(re.escape(n) for n in SEARCH_NAMES))
+_RELEVANCE_RE = re.compile("|".join(re.escape(n) for n in SEARCH_NAMES + ["俠醫", "富足診所"]))
+
 # Facebook page
 FACEBOOK_PAGE_URL = "https://www.facebook.com/good.leg.clinic/"
 FACEBOOK_PAGE_ID = "good.leg.clinic"
+FACEBOOK_MOBILE_URL = f"https://mbasic.facebook.com/{FACEBOOK_PAGE_ID}/"
+MOBILE_USER_AGENT = "Mozilla/5.0 (Linux; Android 14; Pixel 8) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Mobile Safari/537.36"
 
 # Google Maps Place ID for rating
 GOOGLE_PLACE_SEARCH = "富足診所"
@@ -82,11 +126,32 @@ HEALTH_MEDIA_DOMAINS = {
     "華人健康網": {"domains": ["top1health.com"], "role": ""},
 }
 
+# Flat domain -> (outlet, category, role) lookup, built once. The alternation is
+# longest-first so that a more specific host (health.businessweekly.com.tw)
+# beats its parent.
+_OUTLET_META = {
+    **{
+        domain: (name, "news_media", "")
+        for name, domains in NEWS_OUTLET_DOMAINS.items()
+        for domain in domains
+    },
+    **{
+        domain: (name, "health_media", info.get("role", ""))
+        for name, info in HEALTH_MEDIA_DOMAINS.items()
+        for domain in info["domains"]
+    },
+}
+_DOMAIN_RE = re.compile("|".join(
+    re.escape(d) for d in sorted(_OUTLET_META, key=len, reverse=True)
+))
+
 
 # ─── UTILITIES ───────────────────────────────────────
 
 def load_data():
     if DATA_FILE.exists():
+        if orjson:
+            return orjson.loads(DATA_FILE.read_bytes())
         with open(DATA_FILE, "r", encoding="utf-8") as f:
             return json.load(f)
     return {
@@ -95,27 +160,54 @@ def load_data():
         "tv_shows": [],
         "health_media": [],
         "news_media": [],
+        "_http_cache": {},
     }
 
 
 def save_data(data):
+    """Write data.json with a fresh last_updated stamp.
+
+    Skips the write when nothing but the timestamp or the HTTP cache validators
+    would change, so no-op runs leave the file (and git) untouched. Stale
+    validators only cost a full fetch next run. Returns True if written."""
+    if DATA_FILE.exists():
+        ignored = ("last_updated", "_http_cache")
+        on_disk = {k: v for k, v in load_data().items() if k not in ignored}
+        if on_disk == {k: v for k, v in data.items() if k not in ignored}:
+            return False
+
     data["last_updated"] = datetime.now(TW_TZ).isoformat()
+    if orjson:
+        # Same bytes as json.dump(ensure_ascii=False, indent=2)
+        DATA_FILE.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return True
     with open(DATA_FILE, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
+    return True
 
 
 def make_id(category, outlet, title):
     raw = f"{category}|{outlet}|{title}"
-    h = hashlib.md5(raw.encode()).hexdigest()[:8]
+    h = hashlib.blake2b(raw.encode(), digest_size=4).hexdigest()
     return f"{category}-{h}"
 
 
-def _add_url_variants(urls, url):
+def _youtube_id(url):
     if "youtu.be/" in url:
-        vid = url.split("youtu.be/")[-1].split("?")[0]
-        urls.add(vid)
-    elif "youtube.com/watch" in url:
-        vid = url.split("v=")[-1].split("&")[0]
+        return url.split("youtu.be/")[-1].split("?")[0]
+    if "youtube.com/watch" in url:
+        return url.split("v=")[-1].split("&")[0]
+    return None
+
+
+def _url_key(url):
+    """Normalized key for deduping candidates: YouTube video ID, or URL without query."""
+    return _youtube_id(url) or url.split("?")[0]
+
+
+def _add_url_variants(urls, url):
+    vid = _youtube_id(url)
+    if vid:
         urls.add(vid)
     urls.add(url)
 
@@ -147,14 +239,40 @@ def get_existing_titles(data):
     for section in ["tv_shows", "health_media", "news_media"]:
         for item in data.get(section, []):
             if item.get("title"):
-                # Normalize: remove spaces and common punctuation
-                t = item["title"].strip()
-                titles.add(t)
-                # Also add a simplified version
-                titles.add(re.sub(r'[\s　！!？?。，,、：:；;（）()【】\[\]「」『』]', '', t))
+                add_title(titles, item["title"])
     return titles
 
 
+def add_title(titles, title):
+    """Add a title and its simplified form to the shared dedup set."""
+    # Normalize: remove spaces and common punctuation
+    t = title.strip()
+    titles.add(t)
+    # Also add a simplified version
+    titles.add(re.sub(r'[\s　！!？?。，,、：:；;（）()【】\[\]「」『』]', '', t))
+
+
+def _conditional_headers(cache, url):
+    """If-None-Match / If-Modified-Since headers from the last response seen for url."""
+    validators = cache.get(url, {})
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("modified"):
+        headers["If-Modified-Since"] = validators["modified"]
+    return headers
+
+
+def _remember_validators(cache, url, headers):
+    """Store a response's ETag / Last-Modified so the next run can send a conditional GET."""
+    etag = headers.get("ETag")
+    modified = headers.get("Last-Modified")
+    if etag or modified:
+        cache[url] = {"etag": etag, "modified": modified}
+    else:
+        cache.pop(url, None)
+
+
 def format_follower_count(count):
     """Format follower count in Chinese style with one-decimal 萬 (e.g. 5.3萬)."""
     if count >= 10000:
@@ -180,64 +298,176 @@ def is_duplicate_title(title, existing_titles):
     return False
 
 
-# ─── FACEBOOK FOLLOWERS (Playwright) ─────────────────
+# ─── FACEBOOK FOLLOWERS (mobile site, Playwright fallback) ─
+
+# Embedded JSON in the page's <script> blobs
+_FB_JSON_PATTERN = re.compile(r'"follower_count":\s*(\d+)')
+
+# Visible text. (pattern, is_wan) — is_wan means the number is in units of 萬 (10,000)
+_FB_PATTERNS = [
+    (re.compile(r'([\d,]+)\s*位追蹤者'), False),
+    (re.compile(r'([\d.]+)\s*萬\s*位?追蹤者'), True),
+    (re.compile(r'([\d,]+)\s*followers'), False),
+    (re.compile(r'([\d,]+)\s*人追蹤'), False),
+]
+
+
+def _match_follower_patterns(text):
+    """First plausible count matched by _FB_PATTERNS in text, or None."""
+    for pattern, is_wan in _FB_PATTERNS:
+        match = pattern.search(text)
+        if match:
+            raw = match.group(1)
+            if is_wan:
+                count = int(float(raw) * 10000)
+            else:
+                count = int(raw.replace(',', ''))
+
+            if count > 1000:  # Sanity check
+                return count
+    return None
+
+
+def _extract_follower_count(html):
+    """Return the follower count found in a Facebook page, or None.
+
+    Parses the page once and regex-scans the script blobs that carry
+    follower_count, then the visible text. Only if neither has it does it fall
+    back to scanning the raw HTML (counts inside other scripts or meta tags)."""
+    soup = BeautifulSoup(html, "lxml")
+    for script in soup.find_all("script", string=_FB_JSON_PATTERN):
+        match = _FB_JSON_PATTERN.search(script.string)
+        count = int(match.group(1))
+        if count > 1000:  # Sanity check
+            return count
+
+    count = _match_follower_patterns(soup.get_text(" "))
+    if count:
+        return count
+
+    match = _FB_JSON_PATTERN.search(html)
+    if match and int(match.group(1)) > 1000:
+        return int(match.group(1))
+    return _match_follower_patterns(html)
+
+
+def _fetch_facebook_playwright():
+    """Render the full desktop page in headless Chromium and read the follower count."""
+    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context(
+            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            locale="zh-TW",
+        )
+        page = context.new_page()
+        page.goto(FACEBOOK_PAGE_URL, wait_until="domcontentloaded", timeout=30000)
+        # Return as soon as the follower text renders instead of a fixed sleep
+        try:
+            page.wait_for_selector("text=/追蹤者|人追蹤|followers/", timeout=5000)
+        except PlaywrightTimeoutError:
+            pass
+
+        content = page.content()
+        browser.close()
+
+    return _extract_follower_count(content)
+
 
 def update_facebook_followers(data):
-    """Use Playwright headless browser to read Facebook page follower count."""
+    """Read Facebook page follower count from the mobile site, falling back to Playwright."""
     print("[FB] Fetching follower count...")
+    cache = data.setdefault("_http_cache", {})
+    count = None
     try:
-        from playwright.sync_api import sync_playwright
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                locale="zh-TW",
-            )
-            page = context.new_page()
-            page.goto(FACEBOOK_PAGE_URL, wait_until="domcontentloaded", timeout=30000)
-            page.wait_for_timeout(3000)
-
-            content = page.content()
-            browser.close()
+        # Lightweight mbasic page — plain HTTP, no browser
+        resp = SESSION.get(
+            FACEBOOK_MOBILE_URL,
+            headers={"User-Agent": MOBILE_USER_AGENT, **_conditional_headers(cache, FACEBOOK_MOBILE_URL)},
+            timeout=15,
+        )
+        if resp.status_code == 304:
+            print("[FB] Mobile page unchanged since last run")
+            return False
+        if resp.status_code == 200:
+            count = _extract_follower_count(resp.text)
+            # Only trust a 304 next run if this page actually had the count —
+            # otherwise (e.g. a login wall) we'd skip the Playwright fallback for good.
+            if count:
+                _remember_validators(cache, FACEBOOK_MOBILE_URL, resp.headers)
+        else:
+            print(f"[FB] Mobile endpoint HTTP {resp.status_code}")
+    except Exception as e:
+        print(f"[FB] Mobile endpoint error: {e}")
 
-        # Try to extract follower count from page content
-        patterns = [
-            r'([\d,]+)\s*位追蹤者',
-            r'([\d.]+)\s*萬\s*位?追蹤者',
-            r'([\d,]+)\s*followers',
-            r'"follower_count":\s*(\d+)',
-            r'([\d,]+)\s*人追蹤',
-        ]
-
-        for pattern in patterns:
-            match = re.search(pattern, content)
-            if match:
-                raw = match.group(1)
-                if '萬' in pattern:
-                    count = int(float(raw) * 10000)
-                else:
-                    count = int(raw.replace(',', ''))
-
-                if count > 1000:  # Sanity check
-                    old = data["stats"]["facebook_followers"].get("count", 0)
-                    data["stats"]["facebook_followers"]["count"] = count
-                    data["stats"]["facebook_followers"]["display"] = format_follower_count(count)
-                    print(f"[FB] Updated: {old} -> {count} ({data['stats']['facebook_followers']['display']})")
-                    return True
+    if not count:
+        print("[FB] No count from mobile endpoint, falling back to Playwright...")
+        try:
+            count = _fetch_facebook_playwright()
+        except ImportError:
+            print("[FB] Playwright not installed, skipping")
+            return False
+        except Exception as e:
+            print(f"[FB] Error: {e}")
+            return False
 
+    if not count:
         print("[FB] Could not extract follower count from page")
         return False
 
-    except ImportError:
-        print("[FB] Playwright not installed, skipping")
-        return False
-    except Exception as e:
-        print(f"[FB] Error: {e}")
-        return False
+    old = data["stats"]["facebook_followers"].get("count", 0)
+    data["stats"]["facebook_followers"]["count"] = count
+    data["stats"]["facebook_followers"]["display"] = format_follower_count(count)
+    print(f"[FB] Updated: {old} -> {count} ({data['stats']['facebook_followers']['display']})")
+    return True
 
 
 # ─── GOOGLE RATING (Scraping) ────────────────────────
 
+_RATING_PATTERNS = [
+    re.compile(r'"ratingValue"\s*:\s*"?(\d\.?\d?)"?'),
+    re.compile(r'(\d\.?\d?)\s*顆星'),
+    re.compile(r'(\d\.?\d?)</span>\s*<span[^>]*>\s*\(\d'),
+    re.compile(r'rating["\s:]+(\d\.?\d?)'),
+    re.compile(r'(\d\.\d)\s*分'),
+    re.compile(r'<span[^>]*>(\d\.\d)</span>[^<]*(?:\d{2,3})\s*則'),
+]
+_RATING_SPAN_PATTERN = re.compile(r'\d\.\d')
+
+
+def _extract_rating(html):
+    """Return the Google rating found in a search results page, or None.
+
+    Checks JSON-LD blocks and the aria-hidden rating spans first; only falls
+    back to regex over the whole page when neither carries a rating."""
+    def plausible(raw):
+        try:
+            rating = float(raw)
+        except ValueError:
+            return None
+        return rating if 3.0 <= rating <= 5.0 else None
+
+    soup = BeautifulSoup(html, "lxml")
+    for script in soup.find_all("script", type="application/ld+json"):
+        match = _RATING_PATTERNS[0].search(script.string or "")
+        rating = plausible(match.group(1)) if match else None
+        if rating:
+            return rating
+
+    for span in soup.select('span[aria-hidden="true"]'):
+        text = span.get_text(strip=True)
+        rating = plausible(text) if _RATING_SPAN_PATTERN.fullmatch(text) else None
+        if rating:
+            return rating
+
+    for pattern in _RATING_PATTERNS:
+        for match in pattern.finditer(html):
+            rating = plausible(match.group(1))
+            if rating:
+                return rating
+    return None
+
+
 def update_google_rating(data):
     """Fetch Google Maps rating using Playwright (headless browser)."""
     print("[GOOGLE] Fetching Google rating via Playwright...")
@@ -257,33 +487,19 @@ def update_google_rating(data):
                 f"https://www.google.com/search?q={urllib.parse.quote('富足診所 台中 評價')}&hl=zh-TW",
             ]
 
-            all_patterns = [
-                r'"ratingValue"\s*:\s*"?(\d\.?\d?)"?',
-                r'(\d\.?\d?)\s*顆星',
-                r'(\d\.?\d?)</span>\s*<span[^>]*>\s*\(\d',
-                r'rating["\s:]+(\d\.?\d?)',
-                r'(\d\.\d)\s*分',
-                r'<span[^>]*>(\d\.\d)</span>[^<]*(?:\d{2,3})\s*則',
-            ]
-
             for search_url in strategies:
                 try:
                     page.goto(search_url, wait_until="domcontentloaded", timeout=20000)
                     page.wait_for_timeout(2000)
                     content = page.content()
 
-                    for pattern in all_patterns:
-                        for match in re.finditer(pattern, content):
-                            try:
-                                rating = float(match.group(1))
-                                if 3.0 <= rating <= 5.0:
-                                    old = data["stats"]["google_rating"].get("score", 0)
-                                    data["stats"]["google_rating"]["score"] = rating
-                                    print(f"[GOOGLE] Updated rating: {old} -> {rating}")
-                                    browser.close()
-                                    return True
-                            except (ValueError, IndexError):
-                                continue
+                    rating = _extract_rating(content)
+                    if rating:
+                        old = data["stats"]["google_rating"].get("score", 0)
+                        data["stats"]["google_rating"]["score"] = rating
+                        print(f"[GOOGLE] Updated rating: {old} -> {rating}")
+                        browser.close()
+                        return True
                 except Exception as e:
                     print(f"[GOOGLE] Error with strategy: {e}")
 
@@ -333,16 +549,10 @@ SITE_SEARCH_CONFIGS = [
 ]
 
 
-def search_media_sites(data):
+def search_media_sites(data, existing_urls, existing_titles):
     """Search each media outlet's own site directly — no Google needed."""
     print("[SEARCH] Direct site search (primary method)...")
-    existing_urls = get_existing_urls(data)
-    existing_titles = get_existing_titles(data)
     new_items = []
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/125.0.0.0 Safari/537.36",
-        "Accept-Language": "zh-TW,zh;q=0.9",
-    }
 
     for config in SITE_SEARCH_CONFIGS:
         site_name = config["name"]
@@ -359,7 +569,7 @@ def search_media_sites(data):
             url = config["url_template"].format(kw=kw_encoded, page=page_num)
 
             try:
-                resp = requests.get(url, headers=headers, timeout=15)
+                resp = SESSION.get(url, timeout=15)
                 if resp.status_code != 200:
                     print(f"  [{site_name}] HTTP {resp.status_code}")
                     break
@@ -395,15 +605,7 @@ def _add_article(title, href, date_str, existing_urls, existing_titles, data):
     if is_duplicate_title(title, existing_titles):
         return None
 
-    outlet = classify_outlet(href, "")
-    category = determine_category(outlet)
-
-    role = ""
-    if category == "health_media":
-        for hm_name, hm_info in HEALTH_MEDIA_DOMAINS.items():
-            if outlet == hm_name:
-                role = hm_info.get("role", "")
-                break
+    outlet, category, role = classify_item(href)
 
     new_item = {
         "id": make_id(category[:2], outlet, title),
@@ -419,7 +621,7 @@ def _add_article(title, href, date_str, existing_urls, existing_titles, data):
 
     data[category].append(new_item)
     existing_urls.add(href)
-    existing_titles.add(title)
+    add_title(existing_titles, title)
     print(f"  [+] [{outlet}] {title[:60]}...")
     return new_item
 
@@ -439,7 +641,7 @@ def _parse_ltn(html, existing_urls, existing_titles, data):
 
         # Relevance check: the search result context should mention the doctor
         context_text = div.get_text(" ", strip=True)
-        if not any(n in context_text for n in SEARCH_NAMES + ["富足診所", "俠醫"]):
+        if not _RELEVANCE_RE.search(context_text):
             continue
 
         date_str = ""
@@ -477,7 +679,7 @@ def _parse_ettoday(html, existing_urls, existing_titles, data):
         # Verify relevance: check snippet/parent context for doctor's name
         parent = a_tag.find_parent(["div", "li", "td"])
         snippet = parent.get_text(" ", strip=True) if parent else title
-        if not any(n in snippet for n in SEARCH_NAMES + ["俠醫", "富足診所"]):
+        if not _RELEVANCE_RE.search(snippet):
             continue
 
         date_str = ""
@@ -527,7 +729,7 @@ def _parse_heho(html, existing_urls, existing_titles, data):
         title = a.get_text(strip=True)
         if not title or len(title) < 8:
             continue
-        if not any(n in title for n in SEARCH_NAMES):
+        if not _NAME_RE.search(title):
             continue
         if '/archives/' not in href and '/article/' not in href:
             continue
@@ -549,78 +751,140 @@ def _parse_heho(html, existing_urls, existing_titles, data):
 
 # ─── GOOGLE NEWS RSS (supplementary) ────────────────
 
-def search_google_news(data):
+def search_google_news(data, existing_urls, existing_titles):
     """Search Google News RSS as a supplement to Google Search."""
     print("[NEWS] Google News RSS (supplementary)...")
-    existing_urls = get_existing_urls(data)
-    existing_titles = get_existing_titles(data)
     new_items = []
 
-    for name in SEARCH_NAMES:
-        rss_url = (
-            f"https://news.google.com/rss/search?"
-            f"q={urllib.parse.quote(name)}&hl=zh-TW&gl=TW&ceid=TW:zh-Hant"
-        )
+    urls = [google_news_url(n) for n in SEARCH_NAMES]
+    cache = data.setdefault("_http_cache", {})
+    feeds = asyncio.run(_fetch_all_rss(urls, cache))
+
+    # Collect candidates from every feed first. The name variants overlap, so the
+    # same article usually shows up more than once — dedupe before any network work.
+    candidates = {}
+    for name, url, fetched in zip(SEARCH_NAMES, urls, feeds):
+        if isinstance(fetched, Exception):
+            print(f"[NEWS] RSS error for '{name}': {fetched}")
+            continue
+        if fetched is None:
+            print(f"[NEWS] Feed for '{name}' unchanged since last run")
+            continue
         try:
-            feed = feedparser.parse(rss_url)
+            content, headers = fetched
+            feed = feedparser.parse(content)
             for entry in feed.entries[:30]:
-                title = entry.get("title", "")
                 link = entry.get("link", "")
+                if not link or link in existing_urls:
+                    continue
+                if not _NAME_RE.search(entry.get("title", "")):
+                    continue
+                candidates.setdefault(_url_key(link), entry)
+            # Remember validators only once the feed has parsed, so a bad body
+            # isn't skipped as "unchanged" on the next run.
+            _remember_validators(cache, url, headers)
+        except Exception as e:
+            print(f"[NEWS] RSS error for '{name}': {e}")
 
-                actual_url = resolve_google_news_url(link)
-                if not actual_url:
-                    actual_url = link
+    # Resolve all Google News redirects concurrently — these HEAD requests
+    # dominate wall time when done one by one.
+    links = [e.get("link", "") for e in candidates.values()]
+    with ThreadPoolExecutor(max_workers=16) as ex:
+        resolved = dict(zip(links, ex.map(resolve_google_news_url, links)))
 
-                if actual_url in existing_urls or link in existing_urls:
-                    continue
+    for entry in candidates.values():
+        try:
+            title = entry.get("title", "")
+            link = entry.get("link", "")
 
-                if not any(n in title for n in SEARCH_NAMES):
-                    continue
+            actual_url = resolved.get(link)
+            if not actual_url:
+                actual_url = link
 
-                pub_date = ""
-                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                    dt = datetime(*entry.published_parsed[:6])
-                    pub_date = dt.strftime("%Y-%m-%d")
+            if actual_url in existing_urls:
+                continue
 
-                source_name = ""
-                if " - " in title:
-                    parts = title.rsplit(" - ", 1)
-                    title = parts[0].strip()
-                    source_name = parts[1].strip()
+            pub_date = _entry_date(entry)
 
-                if is_duplicate_title(title, existing_titles):
-                    continue
+            source_name = ""
+            if " - " in title:
+                parts = title.rsplit(" - ", 1)
+                title = parts[0].strip()
+                source_name = parts[1].strip()
+
+            if is_duplicate_title(title, existing_titles):
+                continue
 
-                outlet = classify_outlet(actual_url, source_name)
-                category = determine_category(outlet)
-
-                new_item = {
-                    "id": make_id(category[:2], outlet, title),
-                    "outlet": outlet,
-                    "title": title,
-                    "date": pub_date,
-                    "url": actual_url,
-                    "source": "auto_search",
-                    "added_date": today_str(),
-                }
-
-                data[category].append(new_item)
-                existing_urls.add(actual_url)
-                existing_titles.add(title)
-                new_items.append(new_item)
-                print(f"  [+] [{outlet}] {title[:60]}...")
+            outlet, category, role = classify_item(actual_url, source_name)
+
+            new_item = {
+                "id": make_id(category[:2], outlet, title),
+                "outlet": outlet,
+                "title": title,
+                "date": pub_date,
+                "url": actual_url,
+                "source": "auto_search",
+                "added_date": today_str(),
+            }
+            if role:
+                new_item["outlet_role"] = role
+
+            data[category].append(new_item)
+            existing_urls.add(actual_url)
+            add_title(existing_titles, title)
+            new_items.append(new_item)
+            print(f"  [+] [{outlet}] {title[:60]}...")
 
         except Exception as e:
-            print(f"[NEWS] RSS error for '{name}': {e}")
+            print(f"[NEWS] Error processing entry: {e}")
 
     print(f"[NEWS] Found {len(new_items)} new from RSS")
     return new_items
 
 
+def google_news_url(name):
+    return (
+        f"https://news.google.com/rss/search?"
+        f"q={urllib.parse.quote(name)}&hl=zh-TW&gl=TW&ceid=TW:zh-Hant"
+    )
+
+
+async def _fetch_rss(session, url, cache):
+    """Conditional GET of one feed. Returns (body, headers), or None if unchanged (304)."""
+    async with session.get(
+        url,
+        headers=_conditional_headers(cache, url),
+        timeout=aiohttp.ClientTimeout(total=15),
+    ) as resp:
+        if resp.status == 304:
+            return None
+        resp.raise_for_status()
+        return await resp.read(), resp.headers
+
+
+async def _fetch_all_rss(urls, cache):
+    """Download all RSS feeds concurrently. Failed fetches come back as exceptions."""
+    connector = aiohttp.TCPConnector(limit=10)
+    async with aiohttp.ClientSession(connector=connector, headers=HTTP_HEADERS) as session:
+        return await asyncio.gather(
+            *[_fetch_rss(session, u, cache) for u in urls], return_exceptions=True
+        )
+
+
+def _entry_date(entry):
+    """Publish date as YYYY-MM-DD. feedparser gives a struct_time in
+    published_parsed; fastfeedparser gives an ISO 8601 string in published."""
+    parsed = entry.get("published_parsed")
+    if parsed:
+        return datetime(*parsed[:6]).strftime("%Y-%m-%d")
+    dm = re.match(r'(\d{4}-\d{2}-\d{2})', entry.get("published", "") or "")
+    return dm.group(1) if dm else ""
+
+
 def resolve_google_news_url(google_url):
     """Try to resolve Google News redirect URL to the actual article URL."""
     try:
-        resp = requests.head(google_url, allow_redirects=True, timeout=10)
+        resp = SESSION.head(google_url, allow_redirects=True, timeout=10)
         final_url = resp.url
         # Clean tracking params
         if "?" in final_url:
@@ -634,11 +898,9 @@ def resolve_google_news_url(google_url):
 
 def classify_outlet(url, source_name=""):
     """Match a URL or source name to a known outlet."""
-    all_domains = {**NEWS_OUTLET_DOMAINS, **{k: v["domains"] for k, v in HEALTH_MEDIA_DOMAINS.items()}}
-    for outlet_name, domains in all_domains.items():
-        for domain in domains:
-            if domain in url:
-                return outlet_name
+    m = _DOMAIN_RE.search(url)
+    if m:
+        return _OUTLET_META[m.group(0)][0]
 
     if source_name:
         for outlet_name in list(NEWS_OUTLET_DOMAINS.keys()) + list(HEALTH_MEDIA_DOMAINS.keys()):
@@ -654,6 +916,17 @@ def classify_outlet(url, source_name=""):
         return "其他媒體"
 
 
+def classify_item(url, source_name=""):
+    """Return (outlet, category, role) for a URL — a single lookup when the
+    domain is known, otherwise falls back to classify_outlet's name matching."""
+    m = _DOMAIN_RE.search(url)
+    if m:
+        return _OUTLET_META[m.group(0)]
+    outlet = classify_outlet(url, source_name)
+    role = HEALTH_MEDIA_DOMAINS.get(outlet, {}).get("role", "")
+    return outlet, determine_category(outlet), role
+
+
 def determine_category(outlet):
     """Determine which data section an outlet belongs to."""
     if outlet in HEALTH_MEDIA_DOMAINS:
@@ -663,11 +936,9 @@ def determine_category(outlet):
 
 # ─── YOUTUBE SEARCH (yt-dlp, improved) ───────────────
 
-def search_youtube_shows(data):
+def search_youtube_shows(data, existing_urls, existing_titles):
     """Use yt-dlp to search YouTube for new TV show appearances."""
     print("[YT] Searching YouTube for new TV appearances...")
-    existing_urls = get_existing_urls(data)
-    existing_titles = get_existing_titles(data)
     new_items = []
 
     # Check if yt-dlp is available
@@ -682,175 +953,219 @@ def search_youtube_shows(data):
             print("[YT] Could not install yt-dlp, skipping YouTube search")
             return new_items
 
-    # Strategy 1: Search by show name + doctor name
-    for show_name, show_info in TV_SHOWS.items():
-        for name in SEARCH_NAMES[:1]:
-            query = f"{show_name} {name}"
-            found = _yt_search(query, show_name, show_info, existing_urls, existing_titles, data, new_items, count=10)
-            print(f"  [{show_name}] found {found} new")
+    # Strategy 1: show name + doctor name
+    show_queries = {
+        show_name: f"{show_name} {name}"
+        for show_name in TV_SHOWS
+        for name in SEARCH_NAMES[:1]
+    }
+    # Strategy 2: generic search for doctor name (catch unlisted shows);
+    # Strategy 3: doctor name + interview/專訪
+    generic_queries = [(f"{name} 節目", 15) for name in SEARCH_NAMES] + [("楊智鈞 專訪", 10)]
+
+    # One yt-dlp process for every query — interpreter startup and yt-dlp import
+    # are paid once instead of once per show.
+    results = _yt_batch_search(
+        [(q, 10) for q in show_queries.values()] + generic_queries
+    )
+
+    # Searches overlap heavily; a video already examined this run (accepted or
+    # rejected) would get the same verdict again, so each ID is checked once.
+    seen = set()
 
-    # Strategy 2: Generic search for doctor name on YouTube (catch unlisted shows)
-    for name in SEARCH_NAMES:
-        query = f"{name} 節目"
-        _yt_search_generic(query, existing_urls, existing_titles, data, new_items, count=15)
+    for show_name, query in show_queries.items():
+        found = _yt_add_show_videos(results[query], show_name, TV_SHOWS[show_name], existing_urls, existing_titles, data, new_items, seen)
+        print(f"  [{show_name}] found {found} new")
 
-    # Strategy 3: Search for doctor name + interview/專訪
-    _yt_search_generic("楊智鈞 專訪", existing_urls, existing_titles, data, new_items, count=10)
+    for query, _ in generic_queries:
+        _yt_add_generic_videos(results[query], existing_urls, existing_titles, data, new_items, seen)
 
     print(f"[YT] Found {len(new_items)} new TV appearances total")
     return new_items
 
 
-def _yt_search(query, show_name, show_info, existing_urls, existing_titles, data, new_items, count=10):
-    """Search YouTube for a specific show."""
-    found = 0
+# Only the fields the handlers use, one tab-separated line per video — avoids
+# yt-dlp serializing (and us parsing) the full metadata dict. The description
+# is JSON-encoded so embedded newlines/tabs stay on one line; title goes last
+# so a stray tab in it can't shift the other columns.
+_YT_PRINT_FIELDS = ("playlist_id", "id", "upload_date", "channel", "description", "title")
+_YT_PRINT_TEMPLATE = "\t".join([
+    "%(playlist_id)s",
+    "%(id)s",
+    "%(upload_date|)s",
+    "%(channel,uploader|)s",
+    "%(description|)j",
+    "%(title)s",
+])
+
+
+def _yt_parse_output(stdout, results):
+    """Parse --print lines from yt-dlp into results, keyed by the query (playlist_id)."""
+    for line in stdout.splitlines():
+        fields = line.split("\t", len(_YT_PRINT_FIELDS) - 1)
+        if len(fields) != len(_YT_PRINT_FIELDS):
+            continue
+        video = dict(zip(_YT_PRINT_FIELDS, fields))
+        if video["description"]:
+            try:
+                video["description"] = json.loads(video["description"])
+            except json.JSONDecodeError:
+                continue
+        if video["playlist_id"] in results:
+            results[video["playlist_id"]].append(video)
+
+
+def _yt_batch_search(queries):
+    """Run every (query, count) search in a single yt-dlp invocation.
+
+    Returns {query: [video, ...]}; each flat-playlist entry carries the search
+    query it came from as playlist_id."""
+    results = {query: [] for query, _ in queries}
     try:
         result = subprocess.run(
             [
                 "yt-dlp",
-                f"ytsearch{count}:{query}",
-                "--dump-json",
+                "--print", _YT_PRINT_TEMPLATE,
                 "--no-download",
                 "--flat-playlist",
+                "--ignore-errors",
+                *[f"ytsearch{count}:{query}" for query, count in queries],
             ],
             capture_output=True,
             text=True,
-            timeout=60,
+            timeout=60 * len(queries),
         )
+        _yt_parse_output(result.stdout, results)
+
+    except subprocess.TimeoutExpired as e:
+        # Keep whatever the queries that did finish already printed. On timeout
+        # the captured output comes back as undecoded bytes.
+        out = e.stdout or ""
+        if isinstance(out, bytes):
+            out = out.decode("utf-8", errors="replace")
+        _yt_parse_output(out[:out.rfind("\n") + 1], results)  # drop a half-written line
+        done = sum(1 for videos in results.values() if videos)
+        print(f"[YT] Timeout running batched search (kept results for {done}/{len(queries)} queries)")
+    except Exception as e:
+        print(f"[YT] Error running batched search: {e}")
 
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
-            try:
-                video = json.loads(line)
-            except json.JSONDecodeError:
-                continue
-
-            video_id = video.get("id", "")
-            title = video.get("title", "")
-            url = f"https://youtu.be/{video_id}"
-
-            if video_id in existing_urls or url in existing_urls:
-                continue
+    return results
 
-            # Verify relevance: the DOCTOR'S NAME must appear in title or description.
-            # (Matching only the show name lets other doctors' episodes through.)
-            description = video.get("description", "") or ""
-            text_to_check = title + " " + description
-            if not any(n in text_to_check for n in SEARCH_NAMES):
-                continue
 
-            if is_duplicate_title(title, existing_titles):
-                continue
+def _yt_add_show_videos(videos, show_name, show_info, existing_urls, existing_titles, data, new_items, seen):
+    """Add new videos from a search for a specific show."""
+    found = 0
+    for video in videos:
+        video_id = video.get("id", "")
+        title = video.get("title", "")
+        url = f"https://youtu.be/{video_id}"
 
-            upload_date = video.get("upload_date", "")
-            if upload_date and len(upload_date) == 8:
-                pub_date = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:8]}"
-            else:
-                pub_date = ""
+        if video_id in seen or video_id in existing_urls or url in existing_urls:
+            continue
+        seen.add(video_id)
 
-            new_item = {
-                "id": make_id("tv", show_name, title),
-                "show": show_name,
-                "show_network": show_info["network"],
-                "title": title,
-                "date": pub_date,
-                "url": url,
-                "source": "auto_search",
-                "added_date": today_str(),
-            }
+        # Verify relevance: the DOCTOR'S NAME must appear in title or description.
+        # (Matching only the show name lets other doctors' episodes through.)
+        description = video.get("description", "") or ""
+        text_to_check = title + " " + description
+        if not _NAME_RE.search(text_to_check):
+            continue
 
-            data["tv_shows"].append(new_item)
-            existing_urls.add(video_id)
-            existing_urls.add(url)
-            existing_titles.add(title)
-            new_items.append(new_item)
-            found += 1
-            print(f"  [+] [{show_name}] {title[:60]}...")
+        if is_duplicate_title(title, existing_titles):
+            continue
 
-    except subprocess.TimeoutExpired:
-        print(f"[YT] Timeout searching for '{query}'")
-    except Exception as e:
-        print(f"[YT] Error searching for '{query}': {e}")
+        upload_date = video.get("upload_date", "")
+        if upload_date and len(upload_date) == 8:
+            pub_date = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:8]}"
+        else:
+            pub_date = ""
+
+        new_item = {
+            "id": make_id("tv", show_name, title),
+            "show": show_name,
+            "show_network": show_info["network"],
+            "title": title,
+            "date": pub_date,
+            "url": url,
+            "source": "auto_search",
+            "added_date": today_str(),
+        }
+
+        data["tv_shows"].append(new_item)
+        existing_urls.add(video_id)
+        existing_urls.add(url)
+        add_title(existing_titles, title)
+        new_items.append(new_item)
+        found += 1
+        print(f"  [+] [{show_name}] {title[:60]}...")
 
     return found
 
 
-def _yt_search_generic(query, existing_urls, existing_titles, data, new_items, count=10):
-    """Search YouTube generically — auto-detect which show it belongs to."""
-    try:
-        result = subprocess.run(
-            [
-                "yt-dlp",
-                f"ytsearch{count}:{query}",
-                "--dump-json",
-                "--no-download",
-                "--flat-playlist",
-            ],
-            capture_output=True,
-            text=True,
-            timeout=60,
-        )
+def _yt_add_generic_videos(videos, existing_urls, existing_titles, data, new_items, seen):
+    """Add new videos from a generic search — auto-detect which show each belongs to."""
+    for video in videos:
+        video_id = video.get("id", "")
+        title = video.get("title", "")
+        channel = video.get("channel", "")
+        url = f"https://youtu.be/{video_id}"
 
-        for line in result.stdout.strip().split("\n"):
-            if not line:
-                continue
-            try:
-                video = json.loads(line)
-            except json.JSONDecodeError:
-                continue
+        if video_id in seen or video_id in existing_urls or url in existing_urls:
+            continue
+        seen.add(video_id)
 
-            video_id = video.get("id", "")
-            title = video.get("title", "")
-            channel = video.get("channel", "") or video.get("uploader", "") or ""
-            url = f"https://youtu.be/{video_id}"
+        if not _NAME_RE.search(title):
+            continue
 
-            if video_id in existing_urls or url in existing_urls:
-                continue
+        if is_duplicate_title(title, existing_titles):
+            continue
 
-            if not any(n in title for n in SEARCH_NAMES):
-                continue
+        # Try to detect which show this belongs to
+        show_name = "網路直播/專訪"
+        show_network = ""
+        for sn, si in TV_SHOWS.items():
+            if sn in title or sn in channel or any(kw in channel for kw in si["channel_keywords"]):
+                show_name = sn
+                show_network = si["network"]
+                break
 
-            if is_duplicate_title(title, existing_titles):
-                continue
+        upload_date = video.get("upload_date", "")
+        if upload_date and len(upload_date) == 8:
+            pub_date = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:8]}"
+        else:
+            pub_date = ""
 
-            # Try to detect which show this belongs to
-            show_name = "網路直播/專訪"
-            show_network = ""
-            for sn, si in TV_SHOWS.items():
-                if sn in title or sn in channel or any(kw in channel for kw in si["channel_keywords"]):
-                    show_name = sn
-                    show_network = si["network"]
-                    break
+        new_item = {
+            "id": make_id("tv", show_name, title),
+            "show": show_name,
+            "show_network": show_network,
+            "title": title,
+            "date": pub_date,
+            "url": url,
+            "source": "auto_search",
+            "added_date": today_str(),
+        }
 
-            upload_date = video.get("upload_date", "")
-            if upload_date and len(upload_date) == 8:
-                pub_date = f"{upload_date[:4]}-{upload_date[4:6]}-{upload_date[6:8]}"
-            else:
-                pub_date = ""
+        data["tv_shows"].append(new_item)
+        existing_urls.add(video_id)
+        existing_urls.add(url)
+        add_title(existing_titles, title)
+        new_items.append(new_item)
+        print(f"  [+] [{show_name}] {title[:60]}...")
 
-            new_item = {
-                "id": make_id("tv", show_name, title),
-                "show": show_name,
-                "show_network": show_network,
-                "title": title,
-                "date": pub_date,
-                "url": url,
-                "source": "auto_search",
-                "added_date": today_str(),
-            }
 
-            data["tv_shows"].append(new_item)
-            existing_urls.add(video_id)
-            existing_urls.add(url)
-            existing_titles.add(title)
-            new_items.append(new_item)
-            print(f"  [+] [{show_name}] {title[:60]}...")
+# ─── NEWS (site search + RSS) ────────────────────────
 
-    except subprocess.TimeoutExpired:
-        print(f"[YT] Timeout for generic search '{query}'")
-    except Exception as e:
-        print(f"[YT] Error in generic search '{query}': {e}")
+def search_news(data, existing_urls, existing_titles):
+    """Direct site search, then Google News RSS.
+
+    Kept sequential because both add to news_media/health_media: RSS must see
+    what site search just added so the same article isn't added twice."""
+    # Direct site search (primary — scrape each media outlet directly)
+    site_news = search_media_sites(data, existing_urls, existing_titles)
+    # Google News RSS (supplementary — catches things Google Search misses)
+    news = search_google_news(data, existing_urls, existing_titles)
+    return site_news + news
 
 
 # ─── RECALCULATE STATS ───────────────────────────────
@@ -875,40 +1190,38 @@ def main():
     print(f"{'='*60}")
 
     data = load_data()
-    changes = False
 
-    # 1. Facebook followers
-    if update_facebook_followers(data):
-        changes = True
-
-    # 2. Google rating
-    if update_google_rating(data):
-        changes = True
-
-    # 3. Direct site search (primary — scrape each media outlet directly)
-    site_news = search_media_sites(data)
-    if site_news:
-        changes = True
-
-    # 4. Google News RSS (supplementary — catches things Google Search misses)
-    news = search_google_news(data)
-    if news:
-        changes = True
+    # Built once and shared: each search adds the URLs/titles it finds, so
+    # other searches see them without rescanning every section of data.
+    existing_urls = get_existing_urls(data)
+    existing_titles = get_existing_titles(data)
 
-    # 5. YouTube TV show search (expanded)
-    yt = search_youtube_shows(data)
-    if yt:
-        changes = True
+    # 1-5 are I/O-bound, so they run side by side. Each task appends to its own
+    # part of data: FB and Google touch different stats keys, news touches
+    # news_media/health_media, YouTube touches tv_shows. News and YouTube do
+    # share the URL/title sets for cross-section dedupe — but since they now
+    # overlap in time, a title found by one only blocks the other if it was
+    # added before the other checked it (before, YouTube always ran last).
+    tasks = [
+        (update_facebook_followers, (data,)),   # 1. Facebook followers
+        (update_google_rating, (data,)),        # 2. Google rating
+        (search_news, (data, existing_urls, existing_titles)),  # 3-4. Site search + Google News RSS
+        (search_youtube_shows, (data, existing_urls, existing_titles)),  # 5. YouTube TV shows
+    ]
+    with ThreadPoolExecutor(max_workers=len(tasks)) as ex:
+        futures = [ex.submit(fn, *args) for fn, args in tasks]
+    changes = any([f.result() for f in futures])
 
     # 6. Recalculate stats
     recalculate_stats(data)
 
     # 7. Save
-    save_data(data)
-    if changes:
+    if not save_data(data):
+        print(f"\n[DONE] Nothing changed, data.json left untouched.")
+    elif changes:
         print(f"\n[DONE] Data updated with new content.")
     else:
-        print(f"\n[DONE] No new content found, timestamp updated.")
+        print(f"\n[DONE] No new content found, stats refreshed.")
 
     return changes
 